@@ -1,32 +1,101 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import os
+
+@st.cache_data
+def load_movies(movies_file):
+    # Reuse the cleaned Parquet copy from an earlier load unless the CSV is newer
+    parquet_file = os.path.splitext(movies_file)[0] + ".parquet"
+    if os.path.exists(parquet_file) and os.path.getmtime(parquet_file) >= os.path.getmtime(movies_file):
+        return pd.read_parquet(parquet_file, columns=['title', 'popularity'])
+
+    # Check required columns from the header alone, so dtype errors below keep their own message
+    header = pd.read_csv(movies_file, nrows=0).columns
+    if "title" not in header or "popularity" not in header:
+        raise ValueError("CSV must contain 'title' and 'popularity' columns.")
+
+    # Load only the needed columns
+    movies = pd.read_csv(
+        movies_file,
+        usecols=['title', 'popularity'],
+        dtype={'title': 'string', 'popularity': 'float32'},
+        engine='c',
+    )
+
+    # Clean dataset, stored sorted by popularity so the Parquet copy is ready to search
+    movies = movies.dropna()
+    movies = movies[movies['popularity'] > 0].sort_values('popularity', kind='stable').reset_index(drop=True)
+
+    try:
+        movies.to_parquet(parquet_file, compression='zstd', index=False)
+    except OSError:
+        pass  # read-only checkout: keep parsing the CSV
+    return movies
 
-class PopularityRecommender:
-    def __init__(self, movies_file):
-        # Load dataset
-        self.movies = pd.read_csv(movies_file)
-
-        # Check required columns
-        if "title" not in self.movies.columns or "popularity" not in self.movies.columns:
-            raise ValueError("CSV must contain 'title' and 'popularity' columns.")
-
-        # Clean dataset
-        self.movies = self.movies[['title', 'popularity']].dropna()
-        self.movies = self.movies[self.movies['popularity'] > 0].reset_index(drop=True)
 
-    def recommend_by_popularity(self, popularity, locked_range=None):
-        """Recommend movies within ±15% popularity range"""
+class PopularityRecommender:
+    def __init__(self, movies):
+        # Accept either a CSV path or an already cleaned DataFrame
+        if isinstance(movies, pd.DataFrame):
+            self.movies = movies
+        else:
+            self.movies = load_movies(movies)
+
+        # Keep movies sorted by popularity so range lookups are binary searches
+        # (frames from load_movies already are, so the sort is skipped for them)
+        if not self.movies['popularity'].is_monotonic_increasing:
+            self.movies = self.movies.sort_values('popularity', kind='stable')
+        self.movies = self.movies.reset_index(drop=True)
+        # Plain NumPy columns for the hot path; DataFrames are only built for display
+        self._pops = self.movies['popularity'].to_numpy(dtype=np.float32)
+        self._titles = self.movies['title'].to_numpy(dtype=object)
+
+    def _rows(self, positions):
+        """Build a title/popularity frame for the given row positions"""
+        return pd.DataFrame(
+            {'title': self._titles[positions], 'popularity': self._pops[positions]},
+            index=positions,
+        )
+
+    def _window(self, popularity, locked_range=None):
+        """Row positions [lo, hi) within ±15% popularity (or the locked range)"""
         if not locked_range:
             lower = popularity * 0.85
             upper = popularity * 1.15
         else:
             lower, upper = locked_range
 
-        candidates = self.movies[
-            (self.movies['popularity'] >= lower) & (self.movies['popularity'] <= upper)
-        ]
-        return candidates[['title', 'popularity']], (lower, upper)
+        lo = np.searchsorted(self._pops, lower, side='left')
+        hi = np.searchsorted(self._pops, upper, side='right')
+        return lo, hi, (lower, upper)
+
+    def recommend_by_popularity(self, popularity, locked_range=None):
+        """Recommend movies within ±15% popularity range"""
+        lo, hi, locked = self._window(popularity, locked_range)
+        return self._rows(np.arange(lo, hi)), locked
+
+    def recommend_for_positions(self, watched, locked_range=None, n=None, rng=None):
+        """Recommend movies for all watched rows (by position) in a single range lookup"""
+        if len(watched) == 0:
+            return self._rows(np.arange(0)), locked_range
+
+        # The first watched movie locks the range for the whole batch
+        lo, hi, locked = self._window(self._pops[watched[0]], locked_range)
+        positions = np.arange(lo, hi)[~np.isin(self._titles[lo:hi], self._titles[watched])]
+        # One row per title (duplicate titles exist in the dataset)
+        _, first = np.unique(self._titles[positions], return_index=True)
+        positions = positions[np.sort(first)]
+        # Optionally sample n of them on the integer positions, before any frame is built
+        if n is not None:
+            positions = rng.choice(positions, size=min(n, len(positions)), replace=False)
+        return self._rows(positions), locked
+
+
+@st.cache_resource
+def get_recommender(movies_file):
+    # Shared across reruns and sessions; the recommender is read-only after __init__
+    return PopularityRecommender(movies_file)
 
 
 # ---------------- STREAMLIT APP ----------------
@@ -50,149 +119,156 @@ st.markdown(
 )
 
 # Initialize recommender
-recommender = PopularityRecommender("dataset/RevenueMovies.csv")
+recommender = get_recommender("dataset/RevenueMovies.csv")
 
 # Session state
+if "rng" not in st.session_state:
+    st.session_state["rng"] = np.random.default_rng()  # per session, Generators are not thread-safe
+rng = st.session_state["rng"]
 if "locked_range" not in st.session_state:
     st.session_state["locked_range"] = None
 if "selected_movies" not in st.session_state:
     st.session_state["selected_movies"] = []
+    st.session_state["selected_pos"] = []  # row positions of selected_movies (titles are not unique)
 if "recommendations" not in st.session_state:
     st.session_state["recommendations"] = pd.DataFrame()
-if "sample_movies" not in st.session_state:
-    st.session_state["sample_movies"] = recommender.movies.sample(min(20, len(recommender.movies))).reset_index(drop=True)
+    st.session_state["recs_version"] = 0  # bumped whenever a new list is stored (editor key)
+if "sample_idx" not in st.session_state:
+    # Only row positions are kept per session; the frame is gathered from the shared recommender
+    st.session_state["sample_idx"] = rng.choice(len(recommender.movies), size=min(20, len(recommender.movies)), replace=False)
+    st.session_state["sample_kept"] = 0  # leading rows carried over as already selected
 if "selected_recommended" not in st.session_state:
     st.session_state["selected_recommended"] = []  # likes
 if "disliked_recommended" not in st.session_state:
     st.session_state["disliked_recommended"] = []  # explicit dislikes
 if "user_preferences" not in st.session_state:
     st.session_state["user_preferences"] = []
+    st.session_state["user_preference_titles"] = set()  # titles already in user_preferences
 
 
-# Callback helpers to enforce mutual exclusivity
-def _on_like_change(title):
-    # If like was checked, force dislike to False
-    like_key = f"like_{title}"
-    dislike_key = f"dislike_{title}"
-    if st.session_state.get(like_key, False):
-        st.session_state[dislike_key] = False
+# Feedback is a single per-row choice, so Like and Not interested are mutually exclusive
+FEEDBACK_OPTIONS = ["Like", "Not interested"]
 
 
-def _on_dislike_change(title):
-    dislike_key = f"dislike_{title}"
-    like_key = f"like_{title}"
-    if st.session_state.get(dislike_key, False):
-        st.session_state[like_key] = False
+def _with_feedback(recs):
+    # Seed the Feedback column from the current likes / dislikes (kept when titles reappear)
+    liked = set(st.session_state["selected_recommended"])
+    disliked = set(st.session_state["disliked_recommended"])
+    feedback = ["Like" if t in liked else "Not interested" if t in disliked else None for t in recs["title"]]
+    return recs.assign(Feedback=pd.array(feedback, dtype="string"))
 
 
 # ================== Movie Selection ==================
 st.subheader("🎥 Select Movies You Watched (Max 10)")
 
-# Keep previously selected movies always visible
-selected_df = recommender.movies[recommender.movies['title'].isin(st.session_state["selected_movies"])]
-remaining_df = st.session_state["sample_movies"][~st.session_state["sample_movies"]['title'].isin(st.session_state["selected_movies"])]
-all_movies_to_show = pd.concat([selected_df, remaining_df]).drop_duplicates().reset_index(drop=True)
-
-new_selected_movies = []
-for _, row in all_movies_to_show.iterrows():
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        st.write(f"**{row['title']}** (Popularity: {row['popularity']:.2f})")
-    with col2:
-        key = f"movie_{row['title']}"
-        # Ensure key exists so checkbox preserves state across reruns
-        if key not in st.session_state:
-            st.session_state[key] = (row['title'] in st.session_state["selected_movies"])
-        checked = st.checkbox("Select", key=key)
-        if checked:
-            new_selected_movies.append(row['title'])
+# Render the whole sample as one editable table instead of a checkbox widget per row.
+# Previously selected movies are kept at the top of the sample by the refresh handler.
+sample_movies = recommender.movies.iloc[st.session_state["sample_idx"]].reset_index(drop=True)
+sample_movies["Select"] = sample_movies.index < st.session_state["sample_kept"]
+
+# Ticks are batched in a form, so the script only reruns when one of the buttons is pressed
+with st.form("select_movies"):
+    edited_movies = st.data_editor(
+        sample_movies,
+        column_config={
+            "title": st.column_config.TextColumn("Title"),
+            "popularity": st.column_config.NumberColumn("Popularity", format="%.2f"),
+            "Select": st.column_config.CheckboxColumn("Select"),
+        },
+        column_order=["title", "popularity", "Select"],
+        disabled=["title", "popularity"],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    # ================== Buttons: Show + Refresh ==================
+    colA, colB = st.columns([1, 1])
+    with colA:
+        show_recs = st.form_submit_button("📌 Show Recommendations")
+    with colB:
+        refresh_list = st.form_submit_button("🔄 Refresh Movie List")
+
+# Editor rows map 1:1 to sample_idx, so ticks resolve to catalogue positions directly
+new_selected_pos = st.session_state["sample_idx"][edited_movies["Select"].to_numpy(dtype=bool)].tolist()
 
 # cap at 10
-if len(new_selected_movies) > 10:
+if len(new_selected_pos) > 10:
     st.warning("⚠️ You can only select up to 10 movies.")
-    new_selected_movies = new_selected_movies[:10]
+    new_selected_pos = new_selected_pos[:10]
 
 # Update session state with current checked movies (unchecking removes it from calculations)
-st.session_state["selected_movies"] = new_selected_movies
+st.session_state["selected_pos"] = new_selected_pos
+st.session_state["selected_movies"] = recommender.movies['title'].iloc[new_selected_pos].tolist()
 
 if st.session_state["selected_movies"]:
     st.info(f"✅ Selected Movies: {', '.join(st.session_state['selected_movies'])}")
 
 
-# ================== Buttons: Show + Refresh ==================
-colA, colB = st.columns([1, 1])
-with colA:
-    show_recs = st.button("📌 Show Recommendations")
-with colB:
-    refresh_list = st.button("🔄 Refresh Movie List")
-
 # Refresh list of initial movies (keep selected intact & visible, no dups)
 if refresh_list:
     # Keep selected visible, fill remaining slots with new random sample excluding selected
-    pool = recommender.movies[~recommender.movies['title'].isin(st.session_state["selected_movies"])]
-    slots = max(0, 20 - len(st.session_state["selected_movies"]))
-    new_sample = pool.sample(min(slots, len(pool))).reset_index(drop=True)
-    st.session_state["sample_movies"] = pd.concat([
-        recommender.movies[recommender.movies['title'].isin(st.session_state["selected_movies"])],
-        new_sample
-    ]).drop_duplicates(subset=['title']).reset_index(drop=True)
+    selected_pos = st.session_state["selected_pos"]
+    if selected_pos:
+        pool = np.setdiff1d(np.arange(len(recommender.movies)), selected_pos)
+        slots = max(0, 20 - len(selected_pos))
+        new_pos = rng.choice(pool, size=min(slots, len(pool)), replace=False)
+        # Selected rows first, then the new sample (positions are already unique)
+        st.session_state["sample_idx"] = np.concatenate([selected_pos, new_pos])
+    else:
+        # Nothing to keep: draw straight from the whole catalogue
+        st.session_state["sample_idx"] = rng.choice(len(recommender.movies), size=min(20, len(recommender.movies)), replace=False)
+    st.session_state["sample_kept"] = len(selected_pos)
+    # The form above was already drawn from the old sample; rerun so the new one shows now
+    st.rerun()
 
 
 # ================== Recommendations ==================
 if show_recs:
-    all_recs = pd.DataFrame()
     st.session_state["locked_range"] = None  # reset lock when generating new recommendations
-    for title in st.session_state["selected_movies"]:
-        # Guard if title not found (edge case)
-        match = recommender.movies[recommender.movies['title'] == title]
-        if match.empty:
-            continue
-        row = match.iloc[0]
-        recs, locked = recommender.recommend_by_popularity(row['popularity'], st.session_state["locked_range"])
-        st.session_state["locked_range"] = locked
-        recs = recs[recs['title'] != title]
-        all_recs = pd.concat([all_recs, recs])
-
-    if not all_recs.empty:
-        # Remove any items already marked as watched
-        all_recs = all_recs[~all_recs['title'].isin(st.session_state["selected_movies"])]
-        st.session_state["recommendations"] = all_recs.drop_duplicates(subset=['title']).sample(min(10, len(all_recs)))
-    else:
-        st.session_state["recommendations"] = pd.DataFrame()
+    st.session_state["recommendations"] = pd.DataFrame()
+
+    # Nothing selected means nothing to look up
+    if st.session_state["selected_pos"]:
+        recs, st.session_state["locked_range"] = recommender.recommend_for_positions(
+            st.session_state["selected_pos"], st.session_state["locked_range"], n=10, rng=rng
+        )
+        if not recs.empty:
+            st.session_state["recommendations"] = _with_feedback(recs)
+            st.session_state["recs_version"] += 1
 
 
 # Display recommendations
 if not st.session_state["recommendations"].empty:
-    st.subheader("🎯 Interested in any of the movies below? Tick to mark as interested, or mark as not interested. Refresh if not interested in any.")
-
-    # Render like / dislike checkboxes with mutual exclusivity enforced via callbacks
-    for _, row in st.session_state["recommendations"].reset_index(drop=True).iterrows():
-        title = row['title']
-        col1, col2, col3 = st.columns([4, 1.2, 1.8])
-        with col1:
-            st.write(f"**{title}** (Popularity: {row['popularity']:.2f})")
-        like_key = f"like_{title}"
-        dislike_key = f"dislike_{title}"
-
-        # Initialize keys if they don't exist
-        if like_key not in st.session_state:
-            st.session_state[like_key] = (title in st.session_state["selected_recommended"])
-        if dislike_key not in st.session_state:
-            st.session_state[dislike_key] = (title in st.session_state["disliked_recommended"])
-
-        with col2:
-            st.checkbox("Like", key=like_key, on_change=_on_like_change, args=(title,))
-        with col3:
-            st.checkbox("Not interested", key=dislike_key, on_change=_on_dislike_change, args=(title,))
-
-    # After rendering, collect selections
-    like_titles = [t for t in st.session_state["recommendations"]["title"].tolist() if st.session_state.get(f"like_{t}", False)]
-    dislike_titles = [t for t in st.session_state["recommendations"]["title"].tolist() if st.session_state.get(f"dislike_{t}", False)]
+    st.subheader("🎯 Interested in any of the movies below? Mark them as Like or Not interested. Refresh if not interested in any.")
+
+    # One editable table with a Feedback choice per row instead of two checkbox widgets per row
+    edited_recs = st.data_editor(
+        st.session_state["recommendations"],
+        column_config={
+            "title": st.column_config.TextColumn("Title"),
+            "popularity": st.column_config.NumberColumn("Popularity", format="%.2f"),
+            "Feedback": st.column_config.SelectboxColumn("Feedback", options=FEEDBACK_OPTIONS),
+        },
+        column_order=["title", "popularity", "Feedback"],
+        disabled=["title", "popularity"],
+        hide_index=True,
+        use_container_width=True,
+        key=f"recommendations_{st.session_state['recs_version']}",
+    )
+
+    # Collect selections (the index holds catalogue row positions)
+    rec_titles = edited_recs["title"].to_numpy()
+    rec_pos = edited_recs.index.to_numpy()
+    feedback = edited_recs["Feedback"].to_numpy(dtype=object, na_value=None)
+    like_titles = rec_titles[feedback == "Like"].tolist()
+    like_pos = rec_pos[feedback == "Like"].tolist()
+    dislike_titles = rec_titles[feedback == "Not interested"].tolist()
 
     # Optional cap on positive selections
     if len(like_titles) > 5:
         st.warning("⚠️ You can only choose up to 5 liked movies from recommendations.")
         like_titles = like_titles[:5]
+        like_pos = like_pos[:5]
 
     # Persist selections across reruns
     st.session_state["selected_recommended"] = like_titles
@@ -203,20 +279,27 @@ if not st.session_state["recommendations"].empty:
     if st.session_state["disliked_recommended"]:
         st.info(f"🙅 Not interested: {', '.join(st.session_state['disliked_recommended'])}")
 
-    # Capture user preferences for future reference (only likes)
-    if st.session_state["selected_recommended"]:
-        chosen = st.session_state["recommendations"][
-            st.session_state["recommendations"]["title"].isin(st.session_state["selected_recommended"])
-        ]
-        st.session_state["user_preferences"].extend(chosen.to_dict('records'))
+    # Capture user preferences for future reference (only likes), appending each title once
+    # instead of re-adding every current like on each rerun
+    new_likes = [(t, p) for t, p in zip(like_titles, like_pos) if t not in st.session_state["user_preference_titles"]]
+    if new_likes:
+        # Gather the liked rows by catalogue position rather than an isin scan
+        chosen = recommender.movies.iloc[[p for _, p in new_likes]]
+        st.session_state["user_preferences"].extend(chosen[['title', 'popularity']].to_dict('records'))
+        st.session_state["user_preference_titles"].update(t for t, _ in new_likes)
 
     # Refresh recommendations button (keep selections)
     if st.button("🔄 Refresh Recommendations"):
-        st.session_state["recommendations"] = st.session_state["recommendations"].sample(frac=1).reset_index(drop=True)
+        recs = st.session_state["recommendations"]
+        st.session_state["recommendations"] = _with_feedback(recs.iloc[rng.permutation(len(recs))])
+        st.session_state["recs_version"] += 1
+        # The editor above still shows the old order; rerun so the shuffled list (new key) is drawn
+        st.rerun()
 
     # ================== Precision (Feedback-based) ==================
     # We compute precision using only items the user explicitly evaluated (liked or not interested)
-    evaluated = len(set(st.session_state["selected_recommended"]) | set(st.session_state["disliked_recommended"]))
+    # Likes and dislikes are disjoint (one Feedback choice per row), so no set union is needed
+    evaluated = len(st.session_state["selected_recommended"]) + len(st.session_state["disliked_recommended"])
     relevant = len(st.session_state["selected_recommended"])
 
     if evaluated > 0:
@@ -226,8 +309,8 @@ if not st.session_state["recommendations"].empty:
         with st.expander("What does this mean?"):
             st.write(
                 "Precision = Liked ÷ (Liked + Not interested). "
-                "It uses only the movies you evaluated, so clicking 'Not interested' will decrease precision, "
-                "and clicking 'Like' will increase it."
+                "It uses only the movies you evaluated, so marking 'Not interested' will decrease precision, "
+                "and marking 'Like' will increase it."
             )
     else:
         st.info("Mark some recommendations as Like or Not interested to see precision.")
@@ -8,7 +8,7 @@ import pandas as pd
 
 # Load MovieLens data
 movies = pd.read_csv("dataset/movies.csv")
-ratings = pd.read_csv("dataset/ratings.csv")
+ratings = pd.read_csv("dataset/ratings.csv", usecols=["movieId", "rating"], dtype={"movieId": "int32", "rating": "float32"})
 
 st.title("🎬 Movie Recommender System")
 
@@ -0,0 +1,65 @@
+# movieData.py
+# Shared MovieLens helpers for the Genres and Rating explorers. Both pages import
+# these, so the cached load below is parsed once per process instead of once per page.
+import math
+import pandas as pd
+import streamlit as st
+
+MOVIES_PATH  = "dataset/movies.csv"
+RATINGS_PATH = "dataset/ratings.csv"
+
+@st.cache_data
+def load_data(movies_path: str, ratings_path: str):
+    movies  = pd.read_csv(movies_path)
+    # Only movieId/rating are used; skip userId/timestamp and keep narrow dtypes
+    ratings = pd.read_csv(ratings_path, usecols=["movieId", "rating"], dtype={"movieId": "int32", "rating": "float32"})
+
+    # Extract year
+    if "year" not in movies:
+        movies["year"] = movies["title"].str.extract(r"\((\d{4})\)", expand=False).astype("float64")
+    # Clean title
+    if "clean_title" not in movies:
+        movies["clean_title"] = movies["title"].str.replace(r"\s*\(\d{4}\)", "", regex=True)
+
+    # Per-movie vote count / mean and the global mean only depend on the ratings,
+    # so they are computed here once (cached) instead of on every filter change.
+    # The raw ratings are not returned; the pages only need these aggregates.
+    stats = (
+        ratings.groupby("movieId")
+               .agg(v=("rating","count"), R=("rating","mean"))
+               .reset_index()
+    )
+    stats.attrs["global_mean_C"] = float(ratings["rating"].mean())
+
+    # Genre list (dropdowns) and min/max year (sliders)
+    genres = sorted({g for gs in movies["genres"].dropna().str.split("|") for g in gs if g != "(no genres listed)"})
+    y_min, y_max = int(movies["year"].min()), int(movies["year"].max())
+
+    return movies, stats, ["All"] + genres, (y_min, y_max)
+
+def compute_weighted_table(
+    stats: pd.DataFrame,
+    movies: pd.DataFrame,
+    min_votes_quantile: float = 0.80,
+    genre_filter: str | list[str] | None = None,
+    year_range: tuple[int,int] | None = None,
+    min_votes_abs: int | None = None,
+):
+    C   = stats.attrs["global_mean_C"]
+    m_q = float(stats["v"].quantile(min_votes_quantile))
+    m   = int(min_votes_abs) if min_votes_abs is not None else int(math.ceil(m_q))
+    weighted = (stats["v"]/(stats["v"]+m))*stats["R"] + (m/(stats["v"]+m))*C
+    table = stats.assign(WeightedRating=weighted).merge(movies, on="movieId", how="left")
+
+    # Apply filters (a single genre or a list of genres; "All" means no filter)
+    genres = [genre_filter] if isinstance(genre_filter, str) else list(genre_filter or [])
+    if genres and [g.lower() for g in genres] != ["all"]:
+        regex = "|".join(genres)
+        table = table[table["genres"].str.contains(regex, case=False, na=False)]
+    if year_range:
+        y0, y1 = year_range
+        # Single inclusive range test; titles without a year (NaN) drop out
+        table = table[table["year"].between(y0, y1)]
+
+    table = table.query("v >= @m").sort_values("WeightedRating", ascending=False).copy()
+    return table, C, m
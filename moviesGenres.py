@@ -1,9 +1,7 @@
 import streamlit as st
-import pandas as pd
-import re, math, random
+import random
 
-MOVIES_PATH  = "dataset/movies.csv"
-RATINGS_PATH = "dataset/ratings.csv"
+from movieData import MOVIES_PATH, RATINGS_PATH, load_data, compute_weighted_table
 
 # ------------------ Init Session State ------------------
 if "top10" not in st.session_state:
@@ -12,48 +10,6 @@ if "top10" not in st.session_state:
     st.session_state["C"] = 0
     st.session_state["m"] = 0
 
-# ------------------ Helpers ------------------
-@st.cache_data
-def load_data(movies_path: str, ratings_path: str):
-    movies  = pd.read_csv(movies_path)
-    ratings = pd.read_csv(ratings_path)
-
-    # Extract year
-    if "year" not in movies:
-        movies["year"] = movies["title"].apply(
-            lambda x: int(re.search(r"\((\d{4})\)", x).group(1)) if re.search(r"\((\d{4})\)", x) else None
-        )
-    # Clean title
-    if "clean_title" not in movies:
-        movies["clean_title"] = movies["title"].apply(lambda x: re.sub(r"\s*\(\d{4}\)", "", x))
-
-    return movies, ratings
-
-def compute_weighted_table(ratings, movies, genre_filter=None, year_range=None):
-    stats = (
-        ratings.groupby("movieId")
-               .agg(v=("rating","count"), R=("rating","mean"))
-               .reset_index()
-    )
-    C   = float(ratings["rating"].mean())
-    m_q = float(stats["v"].quantile(0.80))
-    m   = int(math.ceil(m_q))
-
-    stats["WeightedRating"] = (stats["v"]/(stats["v"]+m))*stats["R"] + (m/(stats["v"]+m))*C
-    table = stats.merge(movies, on="movieId", how="left")
-
-    # Apply filters
-    if genre_filter and genre_filter != ["All"]:
-        regex = "|".join(genre_filter)
-        table = table[table["genres"].str.contains(regex, case=False, na=False)]
-    if year_range:
-        y0, y1 = year_range
-        yr = table["year"].astype("Int64")
-        table = table[(yr.fillna(-1) >= y0) & (yr <= y1)]
-
-    table = table.query("v >= @m").copy()
-    return table, C, m
-
 # ------------------ UI ------------------
 st.set_page_config(page_title="Movie Recommender — Genres Module", layout="wide")
 
@@ -76,14 +32,8 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-movies, ratings = load_data(MOVIES_PATH, RATINGS_PATH)
-
-# Genres list
-all_genres = sorted({g for gs in movies["genres"].dropna().str.split("|") for g in gs if g != "(no genres listed)"})
-GENRES = ["All"] + all_genres
-
-# Dynamic year range
-min_year, max_year = int(movies["year"].min()), int(movies["year"].max())
+# Genres list and dynamic year range come with the cached load
+movies, stats, GENRES, (min_year, max_year) = load_data(MOVIES_PATH, RATINGS_PATH)
 
 # User inputs
 selected_genres = st.multiselect("🎭 Select genres:", GENRES, default=["All"])
@@ -92,7 +42,7 @@ year_range = st.slider("📅 Year range:", min_year, max_year, (min_year, max_ye
 # ---------------- Show Recommendations ----------------
 if st.button("📌 Show Recommendations"):
     table, C, m = compute_weighted_table(
-        ratings, movies,
+        stats, movies,
         genre_filter=selected_genres,
         year_range=year_range
     )
@@ -1,64 +1,13 @@
 # movieRating.py
-import math, re #math for cell to round the vote threshold up, re -> regular expression (to pull the year out of movie title)
 import pandas as pd #to load the csv
 import streamlit as st
 
-MOVIES_PATH  = "dataset/movies.csv"
-RATINGS_PATH = "dataset/ratings.csv"
+#Loading and the weighted-rating table are shared with the Genres page
+from movieData import MOVIES_PATH, RATINGS_PATH, load_data, compute_weighted_table
 
 # ------------------ Helpers ------------------
-@st.cache_data
-def load_data(movies_path: str, ratings_path: str):
-    #Load CSV into Data Frame
-    movies  = pd.read_csv(movies_path)
-    ratings = pd.read_csv(ratings_path)
-
-    #if the movies does not already have a year column, extract year from the title 
-    if "year" not in movies:
-        movies["year"] = movies["title"].apply(
-            lambda x: int(re.search(r"\((\d{4})\)", x).group(1)) if re.search(r"\((\d{4})\)", x) else None
-        )
-    if "clean_title" not in movies:
-        movies["clean_title"] = movies["title"].apply(lambda x: re.sub(r"\s*\(\d{4}\)", "", x))
-
-    #Build genre list using dropdown list
-    genres = sorted({g for gs in movies["genres"].dropna().str.split("|") for g in gs if g != "(no genres listed)"})
-    #Compute min/max year (slider)
-    y_min, y_max = int(movies["year"].min()), int(movies["year"].max())
-    #return the data
-    return movies, ratings, ["All"] + genres, (y_min, y_max)
-
-def compute_weighted_table(
-    ratings: pd.DataFrame,
-    movies: pd.DataFrame,
-    min_votes_quantile: float = 0.80,
-    genre_filter: str | None = None,
-    year_range: tuple[int,int] | None = None,
-    min_votes_abs: int | None = None,
-):
-    stats = (
-        ratings.groupby("movieId")
-               .agg(v=("rating","count"), R=("rating","mean"))
-               .reset_index()
-    )
-    C   = float(ratings["rating"].mean())
-    m_q = float(stats["v"].quantile(min_votes_quantile))
-    m   = int(min_votes_abs) if min_votes_abs is not None else int(math.ceil(m_q))
-    stats["WeightedRating"] = (stats["v"]/(stats["v"]+m))*stats["R"] + (m/(stats["v"]+m))*C
-    table = stats.merge(movies, on="movieId", how="left")
-
-    if genre_filter and genre_filter.lower() != "all":
-        table = table[table["genres"].str.contains(genre_filter, case=False, na=False)]
-    if year_range:
-        y0, y1 = year_range
-        yr = table["year"].astype("Int64")
-        table = table[(yr.fillna(-1) >= y0) & (yr <= y1)]
-
-    table = table.query("v >= @m").sort_values("WeightedRating", ascending=False).copy()
-    return table, C, m
-
 def get_top_rated(
-    ratings: pd.DataFrame, movies: pd.DataFrame,
+    stats: pd.DataFrame, movies: pd.DataFrame,
     n: int = 10,  # fixed Top-10
     min_votes_quantile: float = 0.80,
     genre_filter: str | None = None,
@@ -66,7 +15,7 @@ def get_top_rated(
     min_votes_abs: int | None = None,
 ) -> pd.DataFrame:
     table, C, m = compute_weighted_table(
-        ratings, movies,
+        stats, movies,
         min_votes_quantile=min_votes_quantile,
         genre_filter=genre_filter,
         year_range=year_range,
@@ -106,14 +55,14 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-movies, ratings, GENRES, (YMIN, YMAX) = load_data(MOVIES_PATH, RATINGS_PATH)
+movies, stats, GENRES, (YMIN, YMAX) = load_data(MOVIES_PATH, RATINGS_PATH)
 
 quantile = st.slider("Min votes quantile (m from quantile)", 0.50, 0.95, 0.80, 0.01)
 genre = st.selectbox("Genre (optional)", GENRES)
 yr = st.slider("Year range", YMIN, YMAX, (YMIN, YMAX))
 
 top = get_top_rated(
-    ratings, movies,
+    stats, movies,
     n=10,  # fix to Top 10 rated movies
     min_votes_quantile=quantile,
     genre_filter=None if genre == "All" else genre,